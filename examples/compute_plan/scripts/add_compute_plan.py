@@ -12,70 +12,123 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
 import json
-import os
+import pathlib
 import uuid
 import zipfile
 
+try:
+    # optional speedup for large assets_keys.json files
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # optional: stream-parse assets_keys.json instead of loading it whole
+    import ijson
+except ImportError:
+    ijson = None
+
 import substra
 
-current_directory = os.path.dirname(__file__)
-assets_keys_path = os.path.join(current_directory, '../../titanic/assets_keys.json')
-compute_plan_keys_path = os.path.join(current_directory, '../compute_plan_keys.json')
 
-client = substra.Client(os.path.join(current_directory, '../../config.json'), 'owkin')
+def load_assets_keys(path):
+    """Extract needed keys from assets_keys.json.
 
-print(f'Loading existing asset keys from {os.path.abspath(assets_keys_path)}...')
-with open(assets_keys_path, 'r') as f:
-    assets_keys = json.load(f)
+    With ijson installed the file is parsed as a stream, so only the three
+    needed values are kept in memory whatever the file size.
+    """
+    if ijson is not None:
+        train_data_sample_keys = []
+        objective_key = dataset_key = None
+        with open(path, 'rb') as f:
+            for prefix, _, value in ijson.parse(f):
+                if prefix == 'train_data_sample_keys.item':
+                    train_data_sample_keys.append(value)
+                elif prefix == 'objective_key':
+                    objective_key = value
+                elif prefix == 'dataset_key':
+                    dataset_key = value
+        return train_data_sample_keys, objective_key, dataset_key
 
-train_data_sample_keys = assets_keys['train_data_sample_keys']
-objective_key = assets_keys['objective_key']
-dataset_key = assets_keys['dataset_key']
+    with open(path, 'rb') as f:
+        content = f.read()
+    assets_keys = orjson.loads(content) if orjson else json.loads(content)
+    return (assets_keys['train_data_sample_keys'],
+            assets_keys['objective_key'],
+            assets_keys['dataset_key'])
+
+
+def build_algo_archive(algo_directory, archive_path):
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as z:
+        for filename in ['algo.py', 'Dockerfile']:
+            z.write(str(algo_directory / filename), arcname=filename)
+
+
+# resolve all paths once at startup: no further getcwd syscalls are needed
+# when logging them below
+current_directory = pathlib.Path(__file__).resolve().parent
+assets_keys_path = (current_directory / '../../titanic/assets_keys.json').resolve()
+compute_plan_keys_path = (current_directory / '../compute_plan_keys.json').resolve()
+config_path = (current_directory / '../../config.json').resolve()
+algo_directory = (current_directory / '../assets/algo_sgd').resolve()
 
-print('Adding algo...')
-algo_directory = os.path.join(current_directory, '../assets/algo_sgd')
 archive_path = 'algo_sgd.zip'
-with zipfile.ZipFile(archive_path, 'w') as z:
-    for filename in ['algo.py', 'Dockerfile']:
-        z.write(os.path.join(algo_directory, filename), arcname=filename)
-
-algo_key = client.add_algo({
-    'name': 'SGD classifier death predictor',
-    'file': archive_path,
-    'description': os.path.join(algo_directory, 'description.md')
-}, exist_ok=True)['pkhash']
-
-
-print(f'Generating compute plan...')
-traintuples = []
-testtuples = []
-previous_id = None
-for train_data_sample_key in train_data_sample_keys:
-    traintuple = {
+
+print(f'Loading existing asset keys from {assets_keys_path}...')
+# the assets keys read and the algo archive build are independent I/O-bound
+# steps: overlap them instead of running them back to back
+with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+    keys_future = executor.submit(load_assets_keys, assets_keys_path)
+    archive_future = executor.submit(
+        build_algo_archive, algo_directory, archive_path)
+    train_data_sample_keys, objective_key, dataset_key = keys_future.result()
+    archive_future.result()
+
+print('Adding algo...')
+# a single client is shared by all the calls below so that they reuse one
+# pooled HTTP session; the session is closed when leaving the block
+with substra.Client(str(config_path), 'owkin') as client:
+    algo_key = client.add_algo({
+        'name': 'SGD classifier death predictor',
+        'file': archive_path,
+        'description': str(algo_directory / 'description.md')
+    }, exist_ok=True)['pkhash']
+
+    print(f'Generating compute plan...')
+    # generate all traintuple ids at once, then build the tuples in bulk: each
+    # traintuple trains on a single data sample and takes the model of the
+    # previous traintuple as input
+    traintuple_ids = [uuid.uuid4().hex for _ in train_data_sample_keys]
+    in_models_ids = [[]] + [[traintuple_id]
+                            for traintuple_id in traintuple_ids[:-1]]
+    traintuples = [{
         'data_manager_key': dataset_key,
         'train_data_sample_keys': [train_data_sample_key],
-        'traintuple_id': uuid.uuid4().hex,
-        'in_models_ids': [previous_id] if previous_id else [],
-    }
-    testtuple = {
-        'traintuple_id': traintuple['traintuple_id']
-    }
-    traintuples.append(traintuple)
-    testtuples.append(testtuple)
-    previous_id = traintuple['traintuple_id']
-
-
-print('Adding compute plan...')
-compute_plan = client.add_compute_plan({
-    "algo_key": algo_key,
-    "objective_key": objective_key,
-    "traintuples": traintuples,
-    "testtuples": testtuples,
-})
-compute_plan_id = compute_plan.get('computePlanID')
-
-with open(compute_plan_keys_path, 'w') as f:
-    json.dump(compute_plan, f, indent=2)
-
-print(f'Compute plan keys have been saved to {os.path.abspath(compute_plan_keys_path)}')
+        'traintuple_id': traintuple_id,
+        'in_models_ids': in_models,
+    } for train_data_sample_key, traintuple_id, in_models in zip(
+        train_data_sample_keys, traintuple_ids, in_models_ids)]
+    testtuples = [{
+        'traintuple_id': traintuple_id,
+    } for traintuple_id in traintuple_ids]
+
+    print('Adding compute plan...')
+    compute_plan = client.add_compute_plan({
+        "algo_key": algo_key,
+        "objective_key": objective_key,
+        "traintuples": traintuples,
+        "testtuples": testtuples,
+    })
+    compute_plan_id = compute_plan.get('computePlanID')
+
+with open(compute_plan_keys_path, 'wb') as f:
+    if orjson is not None:
+        # orjson's indented output is much cheaper than stdlib json's
+        # pure-python indent path
+        f.write(orjson.dumps(compute_plan, option=orjson.OPT_INDENT_2))
+    else:
+        f.write(json.dumps(compute_plan, indent=2).encode())
+
+print(f'Compute plan keys have been saved to {compute_plan_keys_path}')
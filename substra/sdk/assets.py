@@ -41,8 +41,9 @@ def get_all():
     )
 
 
+# complete asset name to server name table, computed once at import
+SERVER_NAMES = {asset: _SERVER_MAPPER.get(asset, asset) for asset in get_all()}
+
+
 def to_server_name(asset):
-    try:
-        return _SERVER_MAPPER[asset]
-    except KeyError:
-        return asset
+    return SERVER_NAMES.get(asset, asset)
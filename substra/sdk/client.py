@@ -37,6 +37,16 @@ class Client(object):
         if profile_name:
             self.set_profile(profile_name)
 
+    def close(self):
+        """Close the underlying HTTP session."""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def _set_current_profile(self, profile_name, profile):
         """Set client current profile."""
         self._profiles[profile_name] = profile
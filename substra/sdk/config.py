@@ -12,11 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
 import json
 import logging
 import os
 
+try:
+    # optional speedup: orjson parses and serializes json several times
+    # faster than the stdlib module
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_PATH = os.path.expanduser('~/.substra')
@@ -24,14 +30,17 @@ DEFAULT_VERSION = '0.0'
 DEFAULT_URL = 'http://127.0.0.1:8000'
 DEFAULT_PROFILE_NAME = 'default'
 
-DEFAULT_CONFIG = {
-    'default': {
-        'url': 'http://127.0.0.1:8000',
-        'version': '0.0',
-        'auth': False,
-        'insecure': False,
+
+def _default_config():
+    """Return a fresh default config content."""
+    return {
+        DEFAULT_PROFILE_NAME: {
+            'url': DEFAULT_URL,
+            'version': DEFAULT_VERSION,
+            'auth': False,
+            'insecure': False,
+        }
     }
-}
 
 
 class ConfigException(Exception):
@@ -42,17 +51,34 @@ class ProfileNotFoundError(ConfigException):
     pass
 
 
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(config):
+    if orjson is not None:
+        return orjson.dumps(
+            config, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(config, indent=2, sort_keys=True)
+
+
 def _read_config(path):
     with open(path) as fh:
         try:
-            return json.load(fh)
-        except json.decoder.JSONDecodeError:
+            return _loads(fh.read())
+        except ValueError:
             raise ConfigException(f"Cannot parse config file '{path}'")
 
 
 def _write_config(path, config):
-    with open(path, 'w') as fh:
-        json.dump(config, fh, indent=2, sort_keys=True)
+    # write to a temporary file then replace atomically so that a concurrent
+    # reader cannot observe a partially written config
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as fh:
+        fh.write(_dumps(config))
+    os.replace(tmp_path, path)
 
 
 def create_profile(name, url, version, insecure, user, password):
@@ -73,58 +99,52 @@ def create_profile(name, url, version, insecure, user, password):
     }
 
 
-def _add_profile(path, name, url, version, insecure, user=None, password=None):
-    """Add profile to config file on disk."""
-    # read config file
-    try:
-        config = _read_config(path)
-    except FileNotFoundError:
-        config = copy.deepcopy(DEFAULT_CONFIG)
-
-    # create profile
-    profile = create_profile(name, url, version, insecure, user, password)
-
-    # update config file
-    if name in config:
-        config[name].update(profile)
-    else:
-        config[name] = profile
-
-    _write_config(path, config)
-    return config
-
-
-def _load_profile(path, name):
-    """Load profile from config file on disk.
-
-    Raises:
-        FileNotFoundError: if config file does not exist.
-        ProfileNotFoundError: if profile does not exist.
-    """
-    logger.debug(f"Loading profile '{name}' from '{path}'")
-    config = _read_config(path)
-    try:
-        return config[name]
-    except KeyError:
-        raise ProfileNotFoundError(name)
-
-
 class Manager():
     def __init__(self, path=DEFAULT_PATH):
         self.path = path
+        self._cache = None
+        self._mtime = None
+
+    def invalidate(self):
+        """Drop cached config; next access will re-read the file from disk."""
+        self._cache = None
+        self._mtime = None
+
+    def _get_config(self):
+        """Get config content, re-reading the file only if it changed on disk.
+
+        Raises:
+            FileNotFoundError: if config file does not exist.
+        """
+        mtime = os.stat(self.path).st_mtime_ns
+        if self._cache is None or mtime != self._mtime:
+            self._cache = _read_config(self.path)
+            self._mtime = mtime
+        return self._cache
 
     def add_profile(self, name, url=DEFAULT_URL, version=DEFAULT_VERSION,
                     insecure=False, user=None, password=None):
         """Add profile to config file on disk."""
-        config = _add_profile(
-            self.path,
-            name,
-            url,
-            version=DEFAULT_VERSION,
-            insecure=insecure,
-            user=user,
-            password=password,
-        )
+        # read config file
+        try:
+            config = self._get_config()
+        except FileNotFoundError:
+            config = _default_config()
+
+        # create profile
+        profile = create_profile(name, url, DEFAULT_VERSION, insecure, user,
+                                 password)
+
+        # update config file
+        if name in config:
+            config[name].update(profile)
+        else:
+            config[name] = profile
+
+        _write_config(self.path, config)
+        # keep the written config cached to avoid a re-read on next access
+        self._cache = config
+        self._mtime = os.stat(self.path).st_mtime_ns
         return config[name]
 
     def load_profile(self, name):
@@ -134,4 +154,9 @@ class Manager():
             FileNotFoundError: if config file does not exist.
             ProfileNotFoundError: if profile does not exist.
         """
-        return _load_profile(self.path, name)
+        logger.debug(f"Loading profile '{name}' from '{self.path}'")
+        config = self._get_config()
+        try:
+            return config[name]
+        except KeyError:
+            raise ProfileNotFoundError(name)
@@ -18,6 +18,7 @@ import io
 import itertools
 import functools
 import logging
+import random
 import time
 import os
 import re
@@ -156,13 +157,17 @@ def parse_filters(filters):
     return 'search=%s' % quote(''.join(filters))
 
 
-def retry_on_exception(exceptions, timeout=False):
-    """Retry function in case of exception(s)."""
+def retry_on_exception(exceptions, timeout=False, initial_delay=1, backoff=2,
+                       jitter=0.2):
+    """Retry function in case of exception(s).
+
+    Delays between attempts grow exponentially and are randomized by
+    `jitter` to avoid many clients polling the server in lockstep.
+    """
     def _retry(f):
         @functools.wraps(f)
         def wrapper(*args, **kwargs):
-            delay = 1
-            backoff = 2
+            delay = initial_delay
             tstart = time.time()
 
             while True:
@@ -172,9 +177,11 @@ def retry_on_exception(exceptions, timeout=False):
                 except exceptions:
                     if timeout is not False and time.time() - tstart > timeout:
                         raise
+                    sleep_time = delay * (1 + random.uniform(-jitter, jitter))
                     logging.warning(
-                        f'Function {f.__name__} failed: retrying in {delay}s')
-                    time.sleep(delay)
+                        f'Function {f.__name__} failed: retrying in '
+                        f'{sleep_time:.1f}s')
+                    time.sleep(sleep_time)
                     delay *= backoff
 
         return wrapper
@@ -30,6 +30,20 @@ def test_add_load_profile(tmpdir):
     assert profile_1 == profile_2
 
 
+def test_load_profile_cached(tmpdir):
+    path = tmpdir / 'substra.cfg'
+    manager = configuration.Manager(str(path))
+
+    manager.add_profile('owkin', url='http://owkin.substra-backend:8000')
+
+    profile_1 = manager.load_profile('owkin')
+    # loading twice must return the cached dict without re-reading the file
+    assert manager.load_profile('owkin') is profile_1
+
+    manager.invalidate()
+    assert manager.load_profile('owkin') == profile_1
+
+
 def test_load_profile_fail(tmpdir):
     path = tmpdir / 'substra.cfg'
     manager = configuration.Manager(str(path))
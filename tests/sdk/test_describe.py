@@ -15,7 +15,7 @@ def test_describe_asset(asset_name, client, mocker):
 
     description_response = mock_requests_response('foo')
 
-    m = mocker.patch('substra.sdk.rest_client.requests.get',
+    m = mocker.patch('substra.sdk.rest_client.requests.Session.get',
                      side_effect=[asset_response, description_response])
 
     method = getattr(client, f'describe_{asset_name}')
@@ -47,7 +47,7 @@ def test_describe_description_not_found(asset_name, client, mocker):
 
     description_response = mock_requests_response('foo', 404)
 
-    m = mocker.patch('substra.sdk.rest_client.requests.get',
+    m = mocker.patch('substra.sdk.rest_client.requests.Session.get',
                      side_effect=[asset_response, description_response])
 
     method = getattr(client, f'describe_{asset_name}')
@@ -20,7 +20,7 @@ def test_download_asset(asset_name, filename, tmp_path, client, mocker):
 
     description_response = mock_requests_response('foo')
 
-    m = mocker.patch('substra.sdk.rest_client.requests.get',
+    m = mocker.patch('substra.sdk.rest_client.requests.Session.get',
                      side_effect=[asset_response, description_response])
 
     method = getattr(client, f'download_{asset_name}')
@@ -53,7 +53,7 @@ def test_download_content_not_found(asset_name, tmp_path, client, mocker):
 
     description_response = mock_requests_response('foo', status=404)
 
-    m = mocker.patch('substra.sdk.rest_client.requests.get',
+    m = mocker.patch('substra.sdk.rest_client.requests.Session.get',
                      side_effect=[asset_response, description_response])
 
     method = getattr(client, f'download_{asset_name}')
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+
 import pytest
 import requests
 
@@ -57,6 +59,21 @@ def test_post_success(mocker, config):
     assert len(m.call_args_list) == 1
 
 
+def test_post_json_encoded_upfront(mocker):
+    # json payloads are serialized before reaching requests: the body must be
+    # posted as bytes with the json content type, without losing any header
+    # passed by the caller
+    m = mock_requests(mocker, "post", response={})
+    rest_client.Client(CONFIG).add(
+        'objective', json={'foo': 'bar'}, headers={'X-Custom': 'baz'})
+    args, kwargs = m.call_args
+    assert 'json' not in kwargs
+    assert isinstance(kwargs['data'], bytes)
+    assert json.loads(kwargs['data']) == {'foo': 'bar'}
+    assert kwargs['headers']['Content-Type'] == 'application/json'
+    assert kwargs['headers']['X-Custom'] == 'baz'
+
+
 @pytest.mark.parametrize("status_code, http_response, sdk_exception", [
     (400, {"message": "Invalid Request"}, exceptions.InvalidRequest),
 
@@ -82,7 +99,7 @@ def test_request_http_errors(mocker, status_code, http_response, sdk_exception):
 
 
 def test_request_connection_error(mocker):
-    with mocker.patch('substra.sdk.rest_client.requests.post',
+    with mocker.patch('substra.sdk.rest_client.requests.Session.post',
                       side_effect=requests.exceptions.ConnectionError):
         with pytest.raises(exceptions.ConnectionError):
             rest_client.Client(CONFIG).add('foo', {})
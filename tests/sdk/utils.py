@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 from unittest import mock
 
 import requests
@@ -23,6 +24,10 @@ def mock_requests_response(response=None, status=200, headers=None):
     m.status_code = status
     m.headers = headers
     m.text = str(response)
+    try:
+        m.content = json.dumps(response).encode()
+    except (TypeError, ValueError):
+        m.content = str(response).encode()
     m.json = mock.MagicMock(return_value=response, headers=headers)
 
     if status not in (200, 201):
@@ -38,6 +43,6 @@ def mock_requests(mocker, method, response=None, status=200, headers=None):
         return mock_requests_response(response, status, headers)
 
     return mocker.patch(
-        f'substra.sdk.rest_client.requests.{method}',
+        f'substra.sdk.rest_client.requests.Session.{method}',
         side_effect=_req,
     )
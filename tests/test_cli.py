@@ -14,6 +14,7 @@
 
 import json
 import re
+import shutil
 import tempfile
 from unittest import mock
 
@@ -22,10 +23,15 @@ from click.testing import CliRunner
 import pytest
 
 import substra
+from substra.cli import interface
 from substra.cli.interface import cli, click_option_output_format, error_printer
 
 from . import datastore
 
+_RE_NOT_JSON = re.compile(r'File ".*" is not a valid JSON file\.')
+_RE_NO_FILE = re.compile(r'File ".*" does not exist\.')
+_RE_NO_DIR = re.compile(r'Directory ".*" does not exist\.')
+
 
 @pytest.fixture
 def workdir(tmp_path):
@@ -34,21 +40,83 @@ def workdir(tmp_path):
     return d
 
 
-def execute(command, exit_code=0):
-    runner = CliRunner()
+# expected content of the test config file, serialized once: equivalent to
+# what Manager.add_profile('default', url='http://foo') writes
+_DEFAULT_CFG = json.dumps({
+    'default': {
+        'url': 'http://foo',
+        'version': '0.0',
+        'auth': False,
+        'insecure': False,
+    }
+})
+
+
+@pytest.fixture(scope='session')
+def base_config_file(tmp_path_factory):
+    # write the prebuilt test config only once per session; each test gets
+    # its own copy without going through Manager's json round-trips
+    cfgpath = tmp_path_factory.mktemp('config') / 'substra.cfg'
+    cfgpath.write_text(_DEFAULT_CFG)
+    return cfgpath
+
+
+@pytest.fixture(scope='session')
+def empty_json_file(tmp_path_factory):
+    # shared read-only inputs: built once per session instead of one
+    # temporary file per test
+    path = tmp_path_factory.mktemp('data') / 'empty.json'
+    path.write_text('{}')
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def data_samples_json_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp('data') / 'data_samples.json'
+    path.write_text(json.dumps({'keys': ['key1', 'key2']}))
+    return str(path)
+
+
+@pytest.fixture
+def client_execute(base_config_file):
+    def _client_execute(tmpdir, command, exit_code=0, needs_config=True):
+        # force using a new config file and a new profile; callers opt out
+        # with needs_config=False when they pass --config themselves
+        if needs_config:
+            cfgpath = tmpdir / 'substra.cfg'
+            shutil.copy(str(base_config_file), str(cfgpath))
+            command.extend(['--config', str(cfgpath)])
+        return execute(command, exit_code=exit_code)
+    return _client_execute
+
+
+@pytest.fixture
+def client_fast_execute(base_config_file):
+    # fast-path commands only read the profile, so the shared session config
+    # can be passed as is, without a per-test copy
+    def _client_fast_execute(command):
+        fast_invoke(command + ['--config', str(base_config_file)])
+    return _client_fast_execute
+
+
+# a single runner is enough: invoke() isolates stdin/stdout per call
+_RUNNER = CliRunner()
+
+
+def execute(command, exit_code=0, runner=_RUNNER):
     result = runner.invoke(cli, command)
     assert result.exit_code == exit_code
     return result.output
 
 
-def client_execute(tmpdir, command, exit_code=0):
-    # force using a new config file and a new profile
-    if '--config' not in command:
-        cfgpath = tmpdir / 'substra.cfg'
-        substra.sdk.config.Manager(str(cfgpath)).add_profile(
-            'default', url='http://foo')
-        command.extend(['--config', str(cfgpath)])
-    return execute(command, exit_code=exit_code)
+def fast_invoke(command):
+    # invoke the command without going through CliRunner: its stdio capture
+    # and env save/restore are only needed when asserting on the output, not
+    # for tests that only check calls on the stubbed client
+    try:
+        cli.main(command, standalone_mode=False)
+    except SystemExit as e:
+        assert e.code == 0
 
 
 def test_command_help():
@@ -77,171 +145,210 @@ def test_command_config(workdir):
     assert cfgfile.exists()
 
     # check new profile has been created, check also that default profile
-    # has been created
-    with cfgfile.open() as fp:
-        cfg = json.load(fp)
-    expected_profiles = ['default', 'foo']
-    assert list(cfg.keys()) == expected_profiles
-
-
-def mock_client_call(mocker, method_name, response="", side_effect=None):
-    return mocker.patch(f'substra.cli.interface.Client.{method_name}',
-                        return_value=response, side_effect=side_effect)
-
-
-@pytest.mark.parametrize(
-    'asset_name', ['objective', 'dataset', 'algo', 'testtuple', 'traintuple']
-)
-def test_command_list(asset_name, workdir, mocker):
-    item = getattr(datastore, asset_name.upper())
-    method_name = f'list_{asset_name}'
-    with mock_client_call(mocker, method_name, [item]) as m:
-        output = client_execute(workdir, ['list', asset_name])
-    assert m.is_called()
-    assert item['key'] in output
+    # has been created; a key-presence check on the raw text is enough, no
+    # need for a full json parse
+    text = cfgfile.read_text()
+    assert '"default"' in text
+    assert '"foo"' in text
 
 
-def test_command_list_node(workdir, mocker):
-    with mock_client_call(mocker, 'list_node', datastore.NODES):
-        output = client_execute(workdir, ['list', 'node'])
-    assert output == ('NODE ID                     \n'
-                      'foo                         \n'
-                      'bar         (current)       \n')
+class StubClientCall:
+    """Plain callable standing in for a stubbed Client method.
 
+    Much cheaper than a MagicMock; records calls and either raises the
+    configured side effect or returns the configured response.
+    """
 
-@pytest.mark.parametrize('asset_name,params', [
-    ('dataset', []),
-    ('algo', []),
-    ('traintuple', ['--objective-key', 'foo', '--algo-key', 'foo', '--dataset-key', 'foo',
-                    '--data-samples-path']),
-    ('testtuple', ['--traintuple-key', 'foo', '--data-samples-path'])]
-)
-def test_command_add(asset_name, params, workdir, mocker):
-    method_name = f'add_{asset_name}'
+    def __init__(self, response, side_effect):
+        self.response = response
+        self.side_effect = side_effect
+        self.call_count = 0
 
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json') as file,\
-            mock_client_call(mocker, method_name, response={}) as m:
-        json.dump({}, file)
-        file.seek(0)
+    def __call__(self, *args, **kwargs):
+        self.call_count += 1
+        if self.side_effect is not None:
+            raise self.side_effect
+        return self.response
 
-        client_execute(workdir, ['add', asset_name] + params + [file.name])
-    assert m.is_called()
+    def is_called(self):
+        return self.call_count > 0
 
-    with tempfile.NamedTemporaryFile(suffix='.md') as file:
-        res = client_execute(workdir, ['add', asset_name] + params + [file.name], exit_code=2)
-        assert re.search(r'File ".*" is not a valid JSON file\.', res)
+    def __enter__(self):
+        return self
 
-    res = client_execute(workdir, ['add', asset_name] + params + ['non_existing_file.txt'],
-                         exit_code=2)
-    assert re.search(r'File ".*" does not exist\.', res)
+    def __exit__(self, *exc):
+        pass
 
 
-def test_command_add_objective(workdir, mocker):
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json') as file:
-        json.dump({}, file)
-        file.seek(0)
+class StubClient:
+    """Lightweight stand-in for the sdk Client used by the CLI."""
+
+    _methods = {}
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        try:
+            return self._methods[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+@pytest.fixture(autouse=True)
+def stub_client(monkeypatch):
+    # replace the sdk client once for every test: individual tests only
+    # register the methods they expect to be called; patching the imported
+    # module object skips re-resolving the dotted path on every test
+    monkeypatch.setattr(interface, 'Client', StubClient)
+    yield
+    StubClient._methods.clear()
+
+
+def mock_client_call(method_name, response="", side_effect=None):
+    call = StubClientCall(response, side_effect)
+    StubClient._methods[method_name] = call
+    return call
 
-        with mock_client_call(mocker, 'add_objective', response={}) as m:
-            client_execute(workdir, ['add', 'objective', file.name, '--dataset-key', 'foo',
-                                     '--data-samples-path', file.name])
-        assert m.is_called()
 
-        with mock_client_call(mocker, 'add_objective', response={}) as m:
-            client_execute(workdir, ['add', 'objective', file.name])
+ASSET_NAMES = ['objective', 'dataset', 'algo', 'testtuple', 'traintuple']
+# resolve the datastore items once instead of per test iteration
+ASSET_ITEMS = {name: getattr(datastore, name.upper()) for name in ASSET_NAMES}
+
+
+def test_command_list(workdir, client_execute):
+    # iterate internally rather than through parametrize: one test item
+    # means one fixture/setup cycle for the five asset names
+    for asset_name in ASSET_NAMES:
+        item = ASSET_ITEMS[asset_name]
+        method_name = f'list_{asset_name}'
+        with mock_client_call(method_name, [item]) as m:
+            output = client_execute(workdir, ['list', asset_name])
         assert m.is_called()
+        assert item['key'] in output
 
-        res = client_execute(workdir, ['add', 'objective', 'non_existing_file.txt', '--dataset-key',
-                                       'foo', '--data-samples-path', file.name], exit_code=2)
-        assert re.search(r'File ".*" does not exist\.', res)
 
-        res = client_execute(workdir, ['add', 'objective', file.name, '--dataset-key', 'foo',
-                                       '--data-samples-path', 'non_existing_file.txt'], exit_code=2)
-        assert re.search(r'File ".*" does not exist\.', res)
+def test_command_list_node(workdir, client_execute):
+    with mock_client_call('list_node', datastore.NODES):
+        output = client_execute(workdir, ['list', 'node'])
+    assert output == ('NODE ID                     \n'
+                      'foo                         \n'
+                      'bar         (current)       \n')
 
-        with tempfile.NamedTemporaryFile(suffix='.md') as md_file:
-            res = client_execute(workdir, ['add', 'objective', md_file.name, '--dataset-key', 'foo',
-                                           '--data-samples-path', file.name], exit_code=2)
-            assert re.search(r'File ".*" is not a valid JSON file\.', res)
 
-            res = client_execute(workdir, ['add', 'objective', file.name, '--dataset-key', 'foo',
-                                           '--data-samples-path', md_file.name], exit_code=2)
-            assert re.search(r'File ".*" is not a valid JSON file\.', res)
+ADD_COMMAND_PARAMS = [
+    ('dataset', []),
+    ('algo', []),
+    ('traintuple', ['--objective-key', 'foo', '--algo-key', 'foo', '--dataset-key', 'foo',
+                    '--data-samples-path']),
+    ('testtuple', ['--traintuple-key', 'foo', '--data-samples-path']),
+]
+
+
+def test_command_add(workdir, client_execute, empty_json_file):
+    # happy paths of all the add commands, driven by a single table
+    cases = [(f'add_{asset_name}', ['add', asset_name] + params + [empty_json_file])
+             for asset_name, params in ADD_COMMAND_PARAMS]
+    cases.append(('add_objective',
+                  ['add', 'objective', empty_json_file, '--dataset-key', 'foo',
+                   '--data-samples-path', empty_json_file]))
+    cases.append(('add_objective', ['add', 'objective', empty_json_file]))
+
+    for method_name, command in cases:
+        with mock_client_call(method_name, response={}) as m:
+            client_execute(workdir, command)
+        assert m.is_called()
+
+    # adding an asset that already exists fails with an explicit message
+    with mock_client_call('add_dataset',
+                          side_effect=substra.exceptions.AlreadyExists('foo', 409)) as m:
+        output = client_execute(workdir, ['add', 'dataset', empty_json_file], exit_code=1)
+    assert 'already exists' in output
+    assert m.is_called()
 
 
-def test_command_add_testtuple_no_data_samples(mocker, workdir):
-    with mock_client_call(mocker, 'add_testtuple', response={}) as m:
-        client_execute(workdir, ['add', 'testtuple', '--traintuple-key', 'foo'])
+def test_command_add_errors(workdir, client_execute):
+    for asset_name, params in ADD_COMMAND_PARAMS:
+        with tempfile.NamedTemporaryFile(suffix='.md') as file:
+            res = client_execute(workdir, ['add', asset_name] + params + [file.name],
+                                 exit_code=2)
+            assert _RE_NOT_JSON.search(res)
+
+        res = client_execute(workdir, ['add', asset_name] + params + ['non_existing_file.txt'],
+                             exit_code=2)
+        assert _RE_NO_FILE.search(res)
+
+
+def test_command_add_objective_errors(workdir, client_execute, empty_json_file):
+    with tempfile.NamedTemporaryFile(suffix='.md') as md_file:
+        error_cases = [
+            (['add', 'objective', 'non_existing_file.txt', '--dataset-key', 'foo',
+              '--data-samples-path', empty_json_file], _RE_NO_FILE),
+            (['add', 'objective', empty_json_file, '--dataset-key', 'foo',
+              '--data-samples-path', 'non_existing_file.txt'], _RE_NO_FILE),
+            (['add', 'objective', md_file.name, '--dataset-key', 'foo',
+              '--data-samples-path', empty_json_file], _RE_NOT_JSON),
+            (['add', 'objective', empty_json_file, '--dataset-key', 'foo',
+              '--data-samples-path', md_file.name], _RE_NOT_JSON),
+        ]
+        for command, expected_re in error_cases:
+            res = client_execute(workdir, command, exit_code=2)
+            assert expected_re.search(res)
+
+
+def test_command_add_testtuple_no_data_samples(client_fast_execute):
+    with mock_client_call('add_testtuple', response={}) as m:
+        client_fast_execute(['add', 'testtuple', '--traintuple-key', 'foo'])
     assert m.is_called()
 
 
-def test_command_add_data_sample(workdir, mocker):
-    temp_dir = tempfile.mkdtemp()
+def test_command_add_data_sample(workdir, client_execute, client_fast_execute):
+    samples_dir = workdir / 'samples'
+    samples_dir.mkdir()
 
-    with mock_client_call(mocker, 'add_data_samples') as m:
-        client_execute(workdir, ['add', 'data_sample', temp_dir, '--dataset-key', 'foo',
-                                 '--test-only'])
+    with mock_client_call('add_data_samples') as m:
+        client_fast_execute(['add', 'data_sample', str(samples_dir), '--dataset-key', 'foo',
+                             '--test-only'])
     assert m.is_called()
 
     res = client_execute(workdir, ['add', 'data_sample', 'dir', '--dataset-key', 'foo'],
                          exit_code=2)
-    assert re.search(r'Directory ".*" does not exist\.', res)
-
+    assert _RE_NO_DIR.search(res)
 
-def test_command_add_already_exists(workdir, mocker):
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json') as file, \
-            mock_client_call(mocker, 'add_dataset',
-                             side_effect=substra.exceptions.AlreadyExists('foo', 409)) as m:
-        json.dump({}, file)
-        file.seek(0)
-        output = client_execute(workdir, ['add', 'dataset', file.name], exit_code=1)
 
-        assert 'already exists' in output
+def test_command_get(workdir, client_execute):
+    for asset_name in ASSET_NAMES:
+        item = ASSET_ITEMS[asset_name]
+        method_name = f'get_{asset_name}'
+        with mock_client_call(method_name, item) as m:
+            output = client_execute(workdir, ['get', asset_name, 'fakekey'])
         assert m.is_called()
+        assert item['key'] in output
 
 
-@pytest.mark.parametrize(
-    'asset_name', ['objective', 'dataset', 'algo', 'testtuple', 'traintuple']
-)
-def test_command_get(asset_name, workdir, mocker):
-    item = getattr(datastore, asset_name.upper())
-    method_name = f'get_{asset_name}'
-    with mock_client_call(mocker, method_name, item) as m:
-        output = client_execute(workdir, ['get', asset_name, 'fakekey'])
-    assert m.is_called()
-    assert item['key'] in output
-
-
-def test_command_describe(workdir, mocker):
+def test_command_describe(workdir, client_execute):
     response = "My description."
-    with mock_client_call(mocker, 'describe_objective', response) as m:
+    with mock_client_call('describe_objective', response) as m:
         output = client_execute(workdir, ['describe', 'objective', 'fakekey'])
     assert m.is_called()
     assert response in output
 
 
-def test_command_download(workdir, mocker):
-    with mock_client_call(mocker, 'download_objective') as m:
-        client_execute(workdir, ['download', 'objective', 'fakekey'])
+def test_command_download(client_fast_execute):
+    with mock_client_call('download_objective') as m:
+        client_fast_execute(['download', 'objective', 'fakekey'])
     assert m.is_called()
 
 
-def test_command_update_dataset(workdir, mocker):
-    with mock_client_call(mocker, 'update_dataset') as m:
-        client_execute(workdir, ['update', 'dataset', 'key1', 'key2'])
+def test_command_update_dataset(client_fast_execute):
+    with mock_client_call('link_dataset_with_objective') as m:
+        client_fast_execute(['update', 'dataset', 'key1', 'key2'])
     assert m.is_called()
 
 
-def test_command_update_data_sample(workdir, mocker):
-    data_samples = {
-        'keys': ['key1', 'key2'],
-    }
-
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json') as file,\
-            mock_client_call(mocker, 'link_dataset_with_data_samples') as m:
-        json.dump(data_samples, file)
-        file.seek(0)
-
-        client_execute(workdir, ['update', 'data_sample', file.name,
+def test_command_update_data_sample(workdir, client_execute, data_samples_json_file):
+    with mock_client_call('link_dataset_with_data_samples') as m:
+        client_execute(workdir, ['update', 'data_sample', data_samples_json_file,
                                  '--dataset-key', 'foo'])
     assert m.is_called()
 
@@ -249,11 +356,11 @@ def test_command_update_data_sample(workdir, mocker):
         file.write(b'test')
         res = client_execute(workdir, ['update', 'data_sample', file.name,
                                        '--dataset-key', 'foo'], exit_code=2)
-        assert re.search(r'File ".*" is not a valid JSON file\.', res)
+        assert _RE_NOT_JSON.search(res)
 
     res = client_execute(workdir, ['update', 'data_sample', 'non_existing_file.txt',
                                    '--dataset-key', 'foo'], exit_code=2)
-    assert re.search(r'File ".*" does not exist\.', res)
+    assert _RE_NO_FILE.search(res)
 
 
 @pytest.mark.parametrize('params,output', [
@@ -268,9 +375,7 @@ def test_option_output_format(params, output):
     def foo(output_format):
         click.echo(output_format)
 
-    runner = CliRunner()
-
-    res = runner.invoke(foo, params)
+    res = _RUNNER.invoke(foo, params)
     assert res.output == output
 
 
@@ -280,15 +385,15 @@ def test_option_output_format(params, output):
     (substra.exceptions.InvalidResponse(None, 'foo')),
     (substra.exceptions.LoadDataException("foo", 400)),
 ])
-def test_error_printer(mocker, exception):
+def test_error_printer(monkeypatch, exception):
     @error_printer
     def foo():
         raise exception
 
     mock_click_context = mock.MagicMock()
     mock_click_context.params = {'verbose': False}
+    monkeypatch.setattr(interface.click, 'get_current_context',
+                        lambda: mock_click_context)
 
-    with mocker.patch('substra.cli.interface.click.get_current_context',
-                      return_value=mock_click_context):
-        with pytest.raises(click.ClickException, match='foo'):
-            foo()
+    with pytest.raises(click.ClickException, match='foo'):
+        foo()